@@ -7,11 +7,11 @@ and functions for sending these effects.
 
 import contextvars
 import dataclasses as dc
+import itertools
 import re
 import sys
 import threading
 import time
-import uuid
 import warnings
 from typing import Any, Callable, Iterable, TextIO, TypeVar
 
@@ -25,15 +25,37 @@ from .types import (
     FormatLogMessage,
     FormatProgressBar,
     GetProgressBarLock,
+    HasActiveProgressBars,
     Lock,
     LogLevel,
     LogMessage,
     OpenProgressBar,
     ProgressBar,
+    RedrawProgressBars,
     SetProgressBar,
     WriteProgressBars,
 )
 
+_ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;]*m")
+
+_PROGRESSBAR_SEND_INTERVAL = 0.05
+_PROGRESSBAR_MAX_STRIDE = 1024
+
+# Shared by all text writers so that bar ids stay unique when writers are stacked
+_progressbar_ids = itertools.count(1)
+
+
+def _send_log_message(level: LogLevel, message: Any) -> bool:
+    try:
+        fx.send(LogMessage(message=message, level=level))
+    except fx.NoHandlerError:
+        warnings.warn(
+            f"No handler processed log message (level={level.name}): {message!r}",
+            stacklevel=3,
+        )
+        return False
+    return True
+
 
 def log(level: LogLevel, message: Any) -> None:
     """Send a log message with the specified level.
@@ -42,19 +64,19 @@ def log(level: LogLevel, message: Any) -> None:
         level: The severity level of the message.
         message: The message to log (any object that can be converted to string).
     """
+    if not fx.safe_send(HasActiveProgressBars()):
+        if _send_log_message(level, message):
+            fx.safe_send(FlushSink(force=level >= LogLevel.ERROR))
+        return
+
     progressbar_lock = fx.safe_send(GetProgressBarLock())
     if progressbar_lock is not None:
         progressbar_lock.acquire(timeout=1.0)
     try:
         fx.safe_send(ClearProgressBars())
-        try:
-            fx.send(LogMessage(message=message, level=level))
-        except fx.NoHandlerError:
-            warnings.warn(
-                f"No handler processed log message (level={level.name}): {message!r}",
-                stacklevel=2,
-            )
+        _send_log_message(level, message)
         fx.safe_send(WriteProgressBars())
+        # The redrawn bars end without a newline, so a line-buffered stream would hold them back
         fx.safe_send(FlushSink())
     finally:
         if progressbar_lock is not None and progressbar_lock.locked():
@@ -133,44 +155,108 @@ def progressbar(
     except fx.NoHandlerError:
         yield from iterable
         return
+    # Updates are sent every `stride` items or once `_PROGRESSBAR_SEND_INTERVAL` seconds have
+    # passed, whichever comes first. The stride doubles while updates arrive faster than that.
+    stride = 1
+    max_stride = max(1, total // 1000) if total else _PROGRESSBAR_MAX_STRIDE
+    last_sent_k = -1
+    last_sent_time = float("-inf")
+    k = 0
     try:
-        k = 0
         for item in iterable:
-            description = desc_callback(item) if desc_callback else initial_desc
-            set_pbar = SetProgressBar(
-                bar_id=bar_id,
-                value=k,
-                total=total,
-                description=description,
-            )
-            fx.safe_send(set_pbar)
+            now = time.monotonic()
+            if k - last_sent_k >= stride or now - last_sent_time > _PROGRESSBAR_SEND_INTERVAL:
+                if now - last_sent_time < _PROGRESSBAR_SEND_INTERVAL:
+                    stride = min(2 * stride, max_stride)
+                last_sent_k, last_sent_time = k, now
+                fx.safe_send(
+                    SetProgressBar(
+                        bar_id=bar_id,
+                        value=k,
+                        total=total,
+                        description=desc_callback(item) if desc_callback else initial_desc,
+                    )
+                )
             yield item
-            k += 1  # noqa: SIM113 - enumerate would complicate generator logic
-            fx.safe_send(dc.replace(set_pbar, value=k))
+            k += 1
     finally:
+        if k > 0:
+            fx.safe_send(SetProgressBar(bar_id=bar_id, value=k))
         fx.safe_send(CloseProgressBar(bar_id=bar_id))
 
 
-def _text_writer_log_message_handler(file: TextIO, trim_escape_sequences: bool | None = None):
+class _ThrottledFlushSink:
+    """Writes through to a text stream and throttles its flushes.
+
+    Non-forced flushes only reach the underlying stream once `buffer_size` characters have been
+    written since the last flush or `flush_interval` seconds have passed. A skipped flush arms a
+    timer, so written output is flushed at most `flush_interval` seconds later.
+    """
+
+    def __init__(self, file: TextIO, flush_interval: float = 0.1, buffer_size: int = 8192):
+        self.file = file
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._flush_timer: threading.Timer | None = None
+
+    def isatty(self) -> bool:
+        return self.file.isatty()
+
+    def write(self, text: str) -> None:
+        with self._lock:
+            self.file.write(text)
+            self._pending += len(text)
+
+    def flush(self, force: bool = True) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if (
+                not force
+                and self._pending < self.buffer_size
+                and now - self._last_flush < self.flush_interval
+            ):
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+                return
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._pending = 0
+            self.file.flush()
+            self._last_flush = now
+
+
+def _text_writer_log_message_handler(
+    file: _ThrottledFlushSink,
+    trim_escape_sequences: bool | None = None,
+    level: LogLevel = LogLevel.DEBUG,
+):
     if trim_escape_sequences is None:
         trim_escape_sequences = not file.isatty()
-    ansi_escape_pattern = re.compile(r"\x1b\[[0-9;]*m")
 
     @fx.handler
     def _handler_fn(effect: LogMessage[str]):
-        formatted_message = fx.send(FormatLogMessage(effect))
-        if trim_escape_sequences:
-            formatted_message = ansi_escape_pattern.sub("", formatted_message)
-        file.write(f"{formatted_message}\n")
+        if effect.level >= level:
+            # Sinks that strip escape sequences ask for uncolored messages, so stripping only has
+            # work to do when the message text itself contains escape sequences
+            formatted_message = fx.send(FormatLogMessage(effect, color=not trim_escape_sequences))
+            if trim_escape_sequences and "\x1b" in formatted_message:
+                formatted_message = _ANSI_ESCAPE_RE.sub("", formatted_message)
+            file.write(f"{formatted_message}\n")
         fx.safe_send(effect, interpret_final=False)
 
     return _handler_fn
 
 
-def _text_writer_flush_sink_handler(file: TextIO):
+def _text_writer_flush_sink_handler(file: _ThrottledFlushSink):
     @fx.handler
     def _handler_fn(effect: FlushSink):
-        file.flush()
+        file.flush(force=effect.force)
         fx.safe_send(effect, interpret_final=False)
 
     return _handler_fn
@@ -187,7 +273,7 @@ def _text_writer_open_progressbar(
 
             bar_id = effect.bar_id
             if bar_id is None:
-                bar_id = uuid.uuid4()
+                bar_id = next(_progressbar_ids)
             progressbars[bar_id] = ProgressBar(bar_id=bar_id, start_time=time.monotonic())
 
             fx.send(WriteProgressBars())
@@ -228,44 +314,67 @@ def _text_writer_close_progressbar(
 def _text_writer_set_progressbar(progressbars: dict):
     @fx.handler
     def _handler_fn(effect: SetProgressBar):
-        progressbars[effect.bar_id] = dc.replace(
-            progressbars[effect.bar_id],
-            value=effect.value or progressbars[effect.bar_id].value,
-            total=effect.total or progressbars[effect.bar_id].total,
-            description=effect.description or progressbars[effect.bar_id].description,
-            start_time=effect.start_time or progressbars[effect.bar_id].start_time,
-        )
+        state = progressbars[effect.bar_id]
+        if effect.value is not None:
+            state.value = effect.value
+        if effect.total is not None:
+            state.total = effect.total
+        if effect.description is not None:
+            state.description = effect.description
+        if effect.start_time is not None:
+            state.start_time = effect.start_time
         fx.safe_send(effect, interpret_final=False)
 
     return _handler_fn
 
 
-def _text_writer_clear_progressbars(file: TextIO, progressbars: dict):
+def _clear_progressbars_str(progressbars: dict) -> str:
+    if len(progressbars) > 1:
+        return f"\r\033[{len(progressbars) - 1}A\033[J"
+    return "\r\033[J"
+
+
+def _write_progressbars_str(progressbars: dict) -> str:
+    progressbar_strings = [fx.send(FormatProgressBar(state)) for state in progressbars.values()]
+    return "\r" + "\n".join(progressbar_strings) + "\033[K"
+
+
+def _text_writer_clear_progressbars(file: _ThrottledFlushSink, progressbars: dict):
     @fx.handler
     def _handler_fn(effect: ClearProgressBars):
-        file.write("\r")
-        if len(progressbars) > 1:
-            file.write(f"\033[{len(progressbars) - 1}A")
-        file.write("\033[J")
+        file.write(_clear_progressbars_str(progressbars))
         fx.safe_send(effect, interpret_final=False)
 
     return _handler_fn
 
 
-def _text_writer_write_progressbars(file: TextIO, progressbars: dict):
+def _text_writer_write_progressbars(file: _ThrottledFlushSink, progressbars: dict):
     @fx.handler
     def _handler_fn(effect: WriteProgressBars):
-        progressbar_strings = []
-        for state in progressbars.values():
-            progressbar_strings.append(fx.send(FormatProgressBar(state)))
-        file.write("\r")
-        file.write("\n".join(progressbar_strings))
-        file.write("\033[K")
+        file.write(_write_progressbars_str(progressbars))
+        fx.safe_send(effect, interpret_final=False)
+
+    return _handler_fn
+
+
+def _text_writer_redraw_progressbars(file: _ThrottledFlushSink, progressbars: dict):
+    @fx.handler
+    def _handler_fn(effect: RedrawProgressBars):
+        file.write(_clear_progressbars_str(progressbars) + _write_progressbars_str(progressbars))
+        file.flush()
         fx.safe_send(effect, interpret_final=False)
 
     return _handler_fn
 
 
+def _text_writer_has_active_progressbars(progressbars: dict):
+    @fx.handler
+    def _handler_fn(effect: HasActiveProgressBars):
+        return bool(progressbars) or bool(fx.safe_send(effect, interpret_final=False))
+
+    return _handler_fn
+
+
 def _text_writer_get_progressbar_lock(lock: Lock):
     @fx.handler
     def _handler_fn(effect: GetProgressBarLock):
@@ -282,6 +391,7 @@ def _text_writer_format_log_message_handler():
         return format_text_message(
             effect.log_message.message,
             effect.log_message.level,
+            color=effect.color,
         )
 
     return _handler_fn
@@ -295,16 +405,16 @@ def _text_writer_format_progressbar_handler():
     return _handler_fn
 
 
-def _text_writer_file(file: TextIO):
+def _text_writer_file(file: _ThrottledFlushSink, level: LogLevel = LogLevel.DEBUG):
     return fx.stack(
-        _text_writer_log_message_handler(file),
+        _text_writer_log_message_handler(file, level=level),
         _text_writer_flush_sink_handler(file),
         _text_writer_format_log_message_handler(),
     )
 
 
-def _progressbar_background(file: TextIO, progressbar_update_interval: float = 0.1):
-    progressbar_dict: dict[uuid.UUID, ProgressBar] = {}
+def _progressbar_background(file: _ThrottledFlushSink, progressbar_update_interval: float = 0.1):
+    progressbar_dict: dict[int, ProgressBar] = {}
     progressbar_lock = threading.Lock()
 
     updater_stop_event = threading.Event()
@@ -313,9 +423,7 @@ def _progressbar_background(file: TextIO, progressbar_update_interval: float = 0
     def _display_updater():
         while not updater_stop_event.wait(progressbar_update_interval):
             with fx.send(GetProgressBarLock()):
-                fx.safe_send(ClearProgressBars())
-                fx.safe_send(WriteProgressBars())
-                fx.safe_send(FlushSink())
+                fx.safe_send(RedrawProgressBars())
 
     def _stop_progress_updater():
         nonlocal updater_thread
@@ -343,14 +451,16 @@ def _progressbar_background(file: TextIO, progressbar_update_interval: float = 0
             progressbar_dict, progress_updater_stop=_stop_progress_updater
         ),
         _text_writer_get_progressbar_lock(progressbar_lock),
+        _text_writer_has_active_progressbars(progressbar_dict),
         _text_writer_set_progressbar(progressbar_dict),
         _text_writer_write_progressbars(file, progressbar_dict),
         _text_writer_clear_progressbars(file, progressbar_dict),
+        _text_writer_redraw_progressbars(file, progressbar_dict),
     )
 
 
-def _progressbar_foreground(file: TextIO, progressbar_update_interval: float = 0.1):
-    progressbar_dict: dict[uuid.UUID, ProgressBar] = {}
+def _progressbar_foreground(file: _ThrottledFlushSink, progressbar_update_interval: float = 0.1):
+    progressbar_dict: dict[int, ProgressBar] = {}
 
     class _dummy_lock:
         def acquire(self, blocking: bool = True, timeout: float = -1):
@@ -370,51 +480,73 @@ def _progressbar_foreground(file: TextIO, progressbar_update_interval: float = 0
 
     progressbar_lock = _dummy_lock()
 
-    last_update_time = 0.0
+    # Redraw at most once per update interval, tracked as an integer interval count
+    update_interval_ns = max(1, int(progressbar_update_interval * 1e9))
+    last_update_bucket = 0
 
     @fx.handler
     def _update_progressbars(effect: SetProgressBar):
-        nonlocal last_update_time
+        nonlocal last_update_bucket
         fx.safe_send(effect, interpret_final=False)
-        current_time = time.monotonic()
-        if current_time - last_update_time > progressbar_update_interval:
+        update_bucket = time.monotonic_ns() // update_interval_ns
+        if update_bucket != last_update_bucket:
             with fx.send(GetProgressBarLock()):
-                fx.safe_send(ClearProgressBars())
-                fx.safe_send(WriteProgressBars())
-                fx.safe_send(FlushSink())
-            last_update_time = current_time
+                fx.safe_send(RedrawProgressBars())
+            last_update_bucket = update_bucket
 
     return fx.stack(
         _text_writer_open_progressbar(progressbar_dict),
         _text_writer_close_progressbar(progressbar_dict),
         _text_writer_get_progressbar_lock(progressbar_lock),
+        _text_writer_has_active_progressbars(progressbar_dict),
         _text_writer_set_progressbar(progressbar_dict),
         _text_writer_write_progressbars(file, progressbar_dict),
         _text_writer_clear_progressbars(file, progressbar_dict),
+        _text_writer_redraw_progressbars(file, progressbar_dict),
         _update_progressbars,
     )
 
 
 def _text_writer_tty(
-    file: TextIO,
+    file: _ThrottledFlushSink,
     progressbar_update_interval: float = 0.1,
     progressbar_async: bool = True,
+    level: LogLevel = LogLevel.DEBUG,
 ):
     if progressbar_async:
         progressbar_updater = _progressbar_background(file, progressbar_update_interval)
     else:
         progressbar_updater = _progressbar_foreground(file, progressbar_update_interval)
     return fx.stack(
-        _text_writer_file(file),
+        _text_writer_file(file, level),
         _text_writer_format_progressbar_handler(),
         progressbar_updater,
     )
 
 
+class _TextWriter:
+    """Handler context returned by `text_writer` that flushes its sink when left."""
+
+    def __init__(self, handlers, sink: _ThrottledFlushSink):
+        self._handlers = handlers
+        self._sink = sink
+
+    def __enter__(self):
+        return self._handlers.__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            return self._handlers.__exit__(exc_type, exc_value, traceback)
+        finally:
+            self._sink.flush()
+
+
 def text_writer(
     file: TextIO | None = None,
     progressbar_update_interval: float = 0.1,
     progressbar_async: bool = False,
+    flush_interval: float = 0.1,
+    level: LogLevel = LogLevel.DEBUG,
 ):
     """Create a handler context for text-based logging output.
 
@@ -422,6 +554,11 @@ def text_writer(
         file: Output stream (defaults to sys.stdout if None).
         progressbar_update_interval: Update frequency for progress bars (seconds).
         progressbar_async: Whether to update progress bars in a background thread.
+        flush_interval: Maximum time (seconds) that written log output may wait for the stream to
+            be flushed. Error messages, progress bar updates and messages logged while progress
+            bars are shown are always flushed immediately.
+        level: Minimum level of messages to write. Messages below it are passed on without
+            being formatted.
 
     Returns:
         A context manager that handles log messages and progress bars.
@@ -433,7 +570,11 @@ def text_writer(
         ...         process(item)
     """
     output_file = file if file is not None else sys.stdout
+    sink = _ThrottledFlushSink(output_file, flush_interval=flush_interval)
     if output_file.isatty():
-        return _text_writer_tty(output_file, progressbar_update_interval, progressbar_async)
+        handlers = _text_writer_tty(
+            sink, progressbar_update_interval, progressbar_async, level=level
+        )
     else:
-        return _text_writer_file(output_file)
+        handlers = _text_writer_file(sink, level=level)
+    return _TextWriter(handlers, sink)
@@ -1,16 +1,29 @@
 import os
 import shutil
 import time
-from datetime import datetime as DateTime
 
 from termcolor import colored
 
 from .types import LogLevel, ProgressBar
 
 MIN_PROGRESSBAR_LEN = 5
+TERMINAL_WIDTH_TTL = 0.5
 
+# (monotonic time of last query, terminal width in columns)
+_terminal_width_cache: tuple[float, int] = (float("-inf"), 80)
 
-def format_text_message(text: str, level: LogLevel) -> str:
+
+def _terminal_width() -> int:
+    global _terminal_width_cache
+    now = time.monotonic()
+    checked_at, width = _terminal_width_cache
+    if now - checked_at > TERMINAL_WIDTH_TTL:
+        width = shutil.get_terminal_size((80, 20)).columns
+        _terminal_width_cache = (now, width)
+    return width
+
+
+def _colored_level(level: LogLevel) -> str:
     match level:
         case LogLevel.DEBUG:
             level_color = "grey"
@@ -20,49 +33,87 @@ def format_text_message(text: str, level: LogLevel) -> str:
             level_color = "red"
         case _:
             level_color = None
-    level_str = colored(level.name, color=level_color)
-    pid_str = colored(f"({os.getpid()})", color="dark_grey")
-    timestamp = DateTime.now().isoformat(sep=" ", timespec="milliseconds")
-    lines = text.split("\n")
-    if len(lines) > 1:
-        line1, *lines, lineN = lines
-        line1 = f"+ {line1}"
-        lines = [f"| {line}" for line in lines]
-        lineN = f"+ {lineN}"
-        lines = [line1, *lines, lineN]
-    formatted_lines = [f"[ {timestamp} ] {level_str} {pid_str} {line}" for line in lines]
-    return "\n".join(formatted_lines)
+    return colored(level.name, color=level_color)
+
+
+def _prefix_tails(color: bool) -> dict[LogLevel, str]:
+    if color:
+        pid_str = colored(f"({os.getpid()})", color="dark_grey")
+        return {level: f" ] {_colored_level(level)} {pid_str} " for level in LogLevel}
+    pid_str = f"({os.getpid()})"
+    return {level: f" ] {level.name} {pid_str} " for level in LogLevel}
+
+
+# Line prefixes are "<head><milliseconds><tail>", where the head is the timestamp up to the
+# seconds and the tail holds the level and PID
+_PREFIX_TAILS = _prefix_tails(color=True)
+_PLAIN_PREFIX_TAILS = _prefix_tails(color=False)
+
+
+def _refresh_pid() -> None:
+    global _PREFIX_TAILS, _PLAIN_PREFIX_TAILS
+    _PREFIX_TAILS = _prefix_tails(color=True)
+    _PLAIN_PREFIX_TAILS = _prefix_tails(color=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_refresh_pid)
+
+# (epoch second, prefix head) of the most recently formatted line
+_prefix_head_cache: tuple[int, str] = (0, "")
+
+
+def _line_prefix(level: LogLevel, color: bool) -> str:
+    global _prefix_head_cache
+    now = time.time()
+    seconds = int(now)
+    cached_seconds, head = _prefix_head_cache
+    if seconds != cached_seconds:
+        head = time.strftime("[ %Y-%m-%d %H:%M:%S.", time.localtime(seconds))
+        _prefix_head_cache = (seconds, head)
+    tail = _PREFIX_TAILS[level] if color else _PLAIN_PREFIX_TAILS[level]
+    return f"{head}{int((now - seconds) * 1000):03d}{tail}"
+
+
+def format_text_message(text: str, level: LogLevel, color: bool = True) -> str:
+    prefix = _line_prefix(level, color)
+    if "\n" not in text:
+        return prefix + text
+    line1, *lines, lineN = text.split("\n")
+    line1 = f"+ {line1}"
+    lines = [f"| {line}" for line in lines]
+    lineN = f"+ {lineN}"
+    lines = [line1, *lines, lineN]
+    return "\n".join(prefix + line for line in lines)
 
 
 def format_duration(total_seconds: float, sep="") -> str:
     if total_seconds == float("inf"):
         return "inf"
-    days = int(total_seconds // (24 * 3600))
-    remaining_seconds = total_seconds % (24 * 3600)
-    hours = int(remaining_seconds // 3600)
-    remaining_seconds %= 3600
-    minutes = int(remaining_seconds // 60)
-    seconds_val = remaining_seconds % 60
-    parts = []
-    if days > 0:
-        parts.append(f"{days}d")
-    if days > 0 or hours > 0:
-        parts.append(f"{hours:2}h")
-    if days > 0 or hours > 0 or minutes > 0:
-        parts.append(f"{minutes:2}m")
-    if hours == 0 and days == 0:
-        formatted_seconds_str = f"{seconds_val:2.0f}s"
-        parts.append(formatted_seconds_str)
-    return sep.join(parts)
+    if total_seconds < 3600:
+        minutes, seconds = divmod(total_seconds, 60)
+        if minutes:
+            return f"{int(minutes):2}m{sep}{seconds:2.0f}s"
+        return f"{seconds:2.0f}s"
+    hours, seconds = divmod(total_seconds, 3600)
+    days, hours = divmod(int(hours), 24)
+    minutes = int(seconds // 60)
+    if days:
+        return f"{days}d{sep}{hours:2}h{sep}{minutes:2}m"
+    return f"{hours:2}h{sep}{minutes:2}m"
 
 
 def format_progressbar(progressbar_state: ProgressBar):
-    term_width = shutil.get_terminal_size((80, 20)).columns
-    prefix = f"{progressbar_state.description}: " if progressbar_state.description else ""
+    term_width = _terminal_width()
+    value = progressbar_state.value
+    total = progressbar_state.total
+    description = progressbar_state.description
+    prefix = f"{description}: " if description else ""
     elapsed = time.monotonic() - progressbar_state.start_time
+    elapsed_str = format_duration(elapsed)
 
-    if elapsed > 0 and progressbar_state.value > 0:
-        rate = progressbar_state.value / elapsed
+    if elapsed > 0 and value > 0:
+        rate = value / elapsed
         if rate >= 1:
             rate_str = f", {rate:.2f}it/s"
         else:
@@ -70,33 +121,23 @@ def format_progressbar(progressbar_state: ProgressBar):
     else:
         rate_str = ", 0.00it/s"
 
-    if progressbar_state.total is not None and progressbar_state.total > 0:
-        total = max(progressbar_state.value, progressbar_state.total)
-        percentage = min(100, int(100 * progressbar_state.value / total))
-        progress_str = f"{percentage}%|"
+    if total is not None and total > 0:
+        total = max(value, total)
+        progress_str = f"{min(100, int(100 * value / total))}%|"
 
-        elapsed_str = format_duration(elapsed)
-        eta = (
-            (elapsed / progressbar_state.value * (total - progressbar_state.value))
-            if progressbar_state.value > 0
-            else float("inf")
-        )
-        eta_str = format_duration(eta)
-        suffix = f"| {progressbar_state.value}/{total} [{elapsed_str}<{eta_str}{rate_str}]"
+        eta = elapsed / value * (total - value) if value > 0 else float("inf")
+        suffix = f"| {value}/{total} [{elapsed_str}<{format_duration(eta)}{rate_str}]"
 
         progressbar_state_len = term_width - len(prefix) - len(progress_str) - len(suffix)
         progressbar_state_len = max(MIN_PROGRESSBAR_LEN, progressbar_state_len)
 
-        filled_len = int(progressbar_state_len * progressbar_state.value / total)
+        filled_len = int(progressbar_state_len * value / total)
         progressbar_state_render = "█" * filled_len + "-" * (progressbar_state_len - filled_len)
     else:
-        percentage = None
         progress_str = ""
+        suffix = f" {value} [{elapsed_str}{rate_str}]"
 
-        elapsed_str = format_duration(elapsed)
-        suffix = f" {progressbar_state.value} [{elapsed_str}{rate_str}]"
-
-        progressbar_state_len = term_width - len(prefix) - len(progress_str) - len(suffix)
+        progressbar_state_len = term_width - len(prefix) - len(suffix)
         progressbar_state_len = max(MIN_PROGRESSBAR_LEN, progressbar_state_len)
 
         progressbar_state_render = "-" * progressbar_state_len
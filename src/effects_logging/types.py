@@ -1,5 +1,4 @@
 import dataclasses as dc
-import uuid
 from enum import IntEnum
 from typing import Iterable, Protocol, TypeVar
 
@@ -17,47 +16,51 @@ MessageType = TypeVar("MessageType")
 SinkType = TypeVar("SinkType")
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class ProgressBar:
-    bar_id: uuid.UUID
+    bar_id: int
     value: int = 0
     total: int | None = None
     description: str = ""
     start_time: float = 0.0
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class LogMessage[MessageType](fx.Effect[None]):
     message: MessageType
     level: LogLevel
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class ClearProgressBars(fx.Effect[None]): ...
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class WriteProgressBars(fx.Effect[None]): ...
 
 
-@dc.dataclass
-class OpenProgressBar(fx.Effect[uuid.UUID]):
-    bar_id: uuid.UUID | None = None
+@dc.dataclass(slots=True)
+class RedrawProgressBars(fx.Effect[None]): ...
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
+class OpenProgressBar(fx.Effect[int]):
+    bar_id: int | None = None
+
+
+@dc.dataclass(slots=True)
 class CloseProgressBar(fx.Effect[None]):
-    bar_id: uuid.UUID
+    bar_id: int
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class GetProgressBars(fx.Effect[Iterable[ProgressBar]]):
-    bar_ids: Iterable[uuid.UUID] | None = None
+    bar_ids: Iterable[int] | None = None
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class SetProgressBar(fx.Effect[None]):
-    bar_id: uuid.UUID
+    bar_id: int
     value: int | None = None
     total: int | None = None
     description: str | None = None
@@ -72,19 +75,25 @@ class Lock(Protocol):
     def __exit__(self, type, value, traceback) -> None: ...
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class GetProgressBarLock(fx.Effect[Lock]): ...
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
+class HasActiveProgressBars(fx.Effect[bool]): ...
+
+
+@dc.dataclass(slots=True)
 class FormatLogMessage[MessageType, SinkType](fx.Effect[SinkType]):
     log_message: LogMessage[MessageType]
+    color: bool = True
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class FormatProgressBar(fx.Effect[None]):
     progressbar: ProgressBar
 
 
-@dc.dataclass
-class FlushSink(fx.Effect[None]): ...
+@dc.dataclass(slots=True)
+class FlushSink(fx.Effect[None]):
+    force: bool = True
@@ -0,0 +1,68 @@
+"""
+Shared test fixtures.
+"""
+
+import time
+
+import pytest
+
+from effects_logging import core, formatters
+from effects_logging.core import text_writer
+from tests.io_helpers import FileOutput
+
+
+class FakeClock:
+    """Stand-in for the `time` module whose clock only advances on `sleep`."""
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def monotonic_ns(self) -> int:
+        return int(self.now * 1e9)
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Replace the clock used by effects_logging with a `FakeClock`.
+
+    Progress bars default to the foreground updater, which redraws from `SetProgressBar` effects
+    using this clock, so advancing it with `fake_clock.sleep` triggers redraws without waiting.
+    The terminal width is pinned to 80 columns as well, so rendered bars are fully deterministic.
+    """
+    clock = FakeClock()
+    monkeypatch.setattr(core, "time", clock)
+    monkeypatch.setattr(formatters, "time", clock)
+    monkeypatch.setattr(formatters, "_terminal_width", lambda: 80)
+    return clock
+
+
+@pytest.fixture(scope="class")
+def file_writer_env():
+    """A `text_writer` over a `FileOutput` that stays installed for the whole test class.
+
+    Class scope keeps the handlers from leaking into tests that expect none. Request
+    `file_output` to get the stream emptied for the current test.
+    """
+    output = FileOutput()
+    with text_writer(output):
+        yield output
+
+
+@pytest.fixture
+def file_output(file_writer_env):
+    """The output of the class-wide `file_writer_env`, emptied for the current test."""
+    file_writer_env.seek(0)
+    file_writer_env.truncate()
+    return file_writer_env
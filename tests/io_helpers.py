@@ -0,0 +1,38 @@
+"""
+In-memory output streams for tests.
+"""
+
+import io
+
+
+class FileOutput(io.StringIO):
+    """In-memory stream that reports itself as a regular file."""
+
+    def isatty(self) -> bool:
+        return False
+
+
+class TTYOutput(io.StringIO):
+    """In-memory stream that reports itself as a terminal."""
+
+    def isatty(self) -> bool:
+        return True
+
+
+class FlushCountingOutput(FileOutput):
+    """Regular-file stream that counts the flushes reaching it."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.flush_count = 0
+
+    def flush(self) -> None:
+        self.flush_count += 1
+        super().flush()
+
+
+class FlushCountingTTYOutput(FlushCountingOutput):
+    """Terminal stream that counts the flushes reaching it."""
+
+    def isatty(self) -> bool:
+        return True
@@ -2,9 +2,9 @@
 Functional tests for formatters.
 """
 
+import re
 import time
-import uuid
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from effects_logging.formatters import (
     format_duration,
@@ -45,6 +45,40 @@ class TestTextMessageFormatting:
         for result in [debug_result, info_result, warning_result, error_result]:
             assert message in result
 
+    def test_format_text_message_without_color(self):
+        """Test that uncolored formatting contains no escape sequences."""
+        for level in LogLevel:
+            result = format_text_message("Test message", level, color=False)
+            assert "\x1b" not in result
+            assert level.name in result
+            assert "Test message" in result
+
+    def test_format_text_message_prefix_format(self):
+        """Test the exact layout of the timestamp, level and PID prefix."""
+        result = format_text_message("msg", LogLevel.INFO, color=False)
+
+        assert re.fullmatch(
+            r"\[ \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3} \] INFO \(\d+\) msg", result
+        )
+
+    @patch("effects_logging.formatters._prefix_head_cache", (0, ""))
+    def test_format_text_message_timestamp_rolls_over_seconds(self, fake_clock, monkeypatch):
+        """Test that the cached per-second timestamp is reused within a second and renewed after."""
+        strftime = Mock(wraps=time.strftime)
+        monkeypatch.setattr(fake_clock, "strftime", strftime, raising=False)
+
+        timestamps = [1000.25, 1000.75, 1001.5]
+        results = []
+        for timestamp in timestamps:
+            fake_clock.sleep(timestamp - fake_clock.now)
+            results.append(format_text_message("msg", LogLevel.INFO, color=False))
+
+        assert strftime.call_count == 2
+        for result, timestamp in zip(results, timestamps, strict=True):
+            seconds = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(int(timestamp)))
+            milliseconds = round((timestamp % 1) * 1000)
+            assert result.startswith(f"[ {seconds}.{milliseconds:03d} ] INFO (")
+
     def test_format_multiline_message(self):
         """Test formatting of multiline messages."""
         multiline_message = "First line\nSecond line\nThird line"
@@ -64,7 +98,7 @@ class TestProgressBarFormatting:
 
     def test_format_progressbar_with_total(self):
         """Test progress bar formatting with known total."""
-        bar_id = uuid.uuid4()
+        bar_id = 1
         progressbar = ProgressBar(
             bar_id=bar_id,
             value=50,
@@ -82,7 +116,7 @@ class TestProgressBarFormatting:
 
     def test_format_progressbar_without_total(self):
         """Test progress bar formatting without known total."""
-        bar_id = uuid.uuid4()
+        bar_id = 1
         progressbar = ProgressBar(
             bar_id=bar_id,
             value=25,
@@ -100,7 +134,7 @@ class TestProgressBarFormatting:
 
     def test_format_progressbar_no_description(self):
         """Test progress bar formatting without description."""
-        bar_id = uuid.uuid4()
+        bar_id = 1
         progressbar = ProgressBar(
             bar_id=bar_id, value=10, total=20, description="", start_time=time.monotonic() - 2
         )
@@ -111,12 +145,13 @@ class TestProgressBarFormatting:
         assert "10/20" in result or "50%" in result
         assert len(result) > 0
 
+    @patch("effects_logging.formatters._terminal_width_cache", (float("-inf"), 80))
     @patch("shutil.get_terminal_size")
     def test_format_progressbar_respects_terminal_width(self, mock_terminal_size):
         """Test that progress bar respects terminal width."""
         mock_terminal_size.return_value.columns = 50
 
-        bar_id = uuid.uuid4()
+        bar_id = 1
         progressbar = ProgressBar(
             bar_id=bar_id,
             value=1,
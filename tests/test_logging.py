@@ -3,30 +3,44 @@ Functional tests for logging functionality.
 """
 
 import io
+import re
+import time
 import warnings
 
+import pytest
+
 import effects as fx
-from effects_logging import log_debug, log_error, log_info, log_warning
+from effects_logging import formatters, log_debug, log_error, log_info, log_warning, progressbar
 from effects_logging.core import text_writer
-from effects_logging.types import LogLevel, LogMessage
+from effects_logging.types import (
+    ClearProgressBars,
+    HasActiveProgressBars,
+    LogLevel,
+    LogMessage,
+    WriteProgressBars,
+)
+from tests.io_helpers import FileOutput, FlushCountingOutput, FlushCountingTTYOutput, TTYOutput
+
+
+@pytest.fixture
+def captured_messages():
+    """Collect the LogMessage effects sent during a test."""
+    sent = []
+    with fx.handler(sent.append, LogMessage):
+        yield sent
 
 
 class TestBasicLogging:
     """Test basic logging functionality."""
 
-    def test_log_functions_send_correct_effects(self):
+    def test_log_functions_send_correct_effects(self, captured_messages):
         """Test that log functions send the correct LogMessage effects."""
-        effects_sent = []
-
-        def capture_effect(effect):
-            effects_sent.append(effect)
-
-        with fx.handler(capture_effect, LogMessage):
-            log_debug("debug message")
-            log_info("info message")
-            log_warning("warning message")
-            log_error("error message")
+        log_debug("debug message")
+        log_info("info message")
+        log_warning("warning message")
+        log_error("error message")
 
+        effects_sent = captured_messages
         assert len(effects_sent) == 4
         assert effects_sent[0] == LogMessage(message="debug message", level=LogLevel.DEBUG)
         assert effects_sent[1] == LogMessage(message="info message", level=LogLevel.INFO)
@@ -64,19 +78,14 @@ class TestBasicLogging:
             assert "No handler processed log message" in str(w[0].message)
             assert "INFO" in str(w[0].message)
 
-    def test_log_with_various_message_types(self):
+    def test_log_with_various_message_types(self, captured_messages):
         """Test logging with different message types."""
-        effects_sent = []
-
-        def capture_effect(effect):
-            effects_sent.append(effect)
-
-        with fx.handler(capture_effect, LogMessage):
-            log_info("string message")
-            log_info(42)
-            log_info(["list", "message"])
-            log_info({"dict": "message"})
+        log_info("string message")
+        log_info(42)
+        log_info(["list", "message"])
+        log_info({"dict": "message"})
 
+        effects_sent = captured_messages
         assert len(effects_sent) == 4
         assert effects_sent[0].message == "string message"
         assert effects_sent[1].message == 42
@@ -90,18 +99,16 @@ class TestTextWriterBehavior:
     def test_text_writer_detects_tty_vs_file(self):
         """Test that text_writer behaves differently for TTY vs file."""
         # Mock a TTY file
-        tty_file = io.StringIO()
-        tty_file.isatty = lambda: True
+        tty_file = TTYOutput()
 
         # Mock a regular file
-        regular_file = io.StringIO()
-        regular_file.isatty = lambda: False
+        regular_file = FileOutput()
 
         # Both should return handler stacks, but different ones
         tty_handler = text_writer(tty_file)
         file_handler = text_writer(regular_file)
 
-        # Both should be context managers (they return fx.stack objects)
+        # Both should be reusable context managers wrapping the handler stack
         assert hasattr(tty_handler, "__enter__") and hasattr(tty_handler, "__exit__")
         assert hasattr(file_handler, "__enter__") and hasattr(file_handler, "__exit__")
 
@@ -124,3 +131,166 @@ class TestTextWriterBehavior:
         assert lines[0].endswith("+ First line")
         assert lines[1].endswith("| Second line")
         assert lines[2].endswith("+ Third line")
+
+    def test_text_writer_level_filters_messages(self):
+        """Test that text_writer only writes messages at or above its level."""
+        output = io.StringIO()
+
+        with text_writer(output, level=LogLevel.WARNING):
+            log_debug("debug message")
+            log_info("info message")
+            log_warning("warning message")
+            log_error("error message")
+
+        lines = output.getvalue().strip().split("\n")
+        assert len(lines) == 2
+        assert "warning message" in lines[0]
+        assert "error message" in lines[1]
+
+    def test_tty_log_without_progressbar_writes_plain_line(self):
+        """Test that logging to a TTY without open progress bars writes no bar control codes."""
+        output = TTYOutput()
+
+        with text_writer(output):
+            log_info("no bars here")
+
+        result = output.getvalue()
+        assert result.endswith("no bars here\n")
+        assert result.count("\n") == 1
+        assert "\r" not in result
+        assert "\x1b[J" not in result
+        assert "\x1b[K" not in result
+
+    def test_tty_log_inside_progressbar_clears_and_redraws(self, fake_clock):
+        """Test that logging while a bar is open clears the bar first and redraws it after."""
+        output = TTYOutput()
+
+        with text_writer(output):
+            for item in progressbar([1, 2, 3], initial_desc="Working"):
+                if item == 2:
+                    log_info("inside the loop")
+
+        assert re.search(
+            r"\r\x1b\[J[^\r]*inside the loop\n\r[^\r\n]*Working[^\r\n]*\x1b\[K",
+            output.getvalue(),
+        )
+
+    def test_stacked_writers_each_get_their_own_coloring(self, monkeypatch):
+        """Test that stacked TTY and file writers get colored and uncolored lines respectively."""
+        # termcolor drops colors when stdout is not a terminal, so color the level explicitly
+        colored_tails = {level: f" ] \x1b[33m{level.name}\x1b[0m " for level in LogLevel}
+        monkeypatch.setattr(formatters, "_PREFIX_TAILS", colored_tails)
+        tty_output = TTYOutput()
+        file_output = FileOutput()
+
+        with text_writer(tty_output), text_writer(file_output):
+            log_info("stacked")
+
+        assert "stacked" in tty_output.getvalue()
+        assert "\x1b[" in tty_output.getvalue()
+        assert "stacked" in file_output.getvalue()
+        assert "\x1b" not in file_output.getvalue()
+
+    def test_log_clears_custom_progressbar_handlers(self):
+        """Test that log() clears and redraws bars for any handler reporting active bars."""
+        sent = []
+
+        with (
+            fx.handler(sent.append, LogMessage),
+            fx.handler(sent.append, ClearProgressBars),
+            fx.handler(sent.append, WriteProgressBars),
+            fx.handler(lambda effect: True, HasActiveProgressBars),
+        ):
+            log_info("info message")
+
+        assert sent == [
+            ClearProgressBars(),
+            LogMessage(message="info message", level=LogLevel.INFO),
+            WriteProgressBars(),
+        ]
+
+
+class TestTextWriterFlushing:
+    """Test how text_writer writes and flushes its output stream."""
+
+    def test_output_is_written_before_flush(self):
+        """Test that log lines reach the stream immediately, ahead of the throttled flush."""
+        output = FlushCountingOutput()
+
+        with text_writer(output, flush_interval=3600):
+            log_info("starting")
+            assert "starting" in output.getvalue()
+            assert output.flush_count == 0
+
+    def test_log_lines_keep_order_with_direct_writes(self):
+        """Test that log lines are not reordered with direct writes to the same stream."""
+        output = FileOutput()
+
+        with text_writer(output, flush_interval=3600):
+            log_info("first")
+            output.write("second\n")
+
+        result = output.getvalue()
+        assert result.index("first") < result.index("second")
+
+    def test_flushes_once_size_threshold_is_reached(self):
+        """Test that a skipped flush is not deferred once enough output is pending."""
+        output = FlushCountingOutput()
+
+        with text_writer(output, flush_interval=3600):
+            log_info("x" * 10000)
+            assert output.flush_count == 1
+
+    def test_skipped_flush_happens_after_interval(self, fake_clock):
+        """Test that a skipped flush still happens once the flush interval has passed."""
+        output = FlushCountingOutput()
+
+        # The fake clock never advances, so only the flush timer can flush the stream
+        with text_writer(output, flush_interval=0.001):
+            log_info("starting")
+
+            deadline = time.monotonic() + 1.0
+            while output.flush_count == 0 and time.monotonic() < deadline:
+                time.sleep(0.001)
+            assert output.flush_count == 1
+
+    def test_error_messages_flush_immediately(self):
+        """Test that error messages are flushed regardless of the flush interval."""
+        output = FlushCountingOutput()
+
+        with text_writer(output, flush_interval=3600):
+            log_error("An error occurred")
+            assert output.flush_count == 1
+
+    def test_log_inside_progressbar_flushes_redrawn_bars(self, fake_clock):
+        """Test that a log line written while bars are open is flushed with the redrawn bars."""
+        output = FlushCountingTTYOutput()
+
+        with text_writer(output, flush_interval=3600):
+            for _ in progressbar([1, 2], initial_desc="Working"):
+                flush_count = output.flush_count
+                log_info("inside the loop")
+                assert output.flush_count == flush_count + 1
+
+    def test_leaving_context_flushes_output(self):
+        """Test that leaving the text_writer context flushes pending output."""
+        output = FlushCountingOutput()
+
+        with text_writer(output, flush_interval=3600):
+            log_info("starting")
+            assert output.flush_count == 0
+
+        assert output.flush_count == 1
+
+    def test_text_writer_is_reusable(self):
+        """Test that the context returned by text_writer can be entered more than once."""
+        output = FileOutput()
+        writer = text_writer(output)
+
+        with writer:
+            log_info("first")
+        with writer:
+            log_info("second")
+
+        result = output.getvalue()
+        assert "first" in result and "second" in result
@@ -2,11 +2,13 @@
 Functional tests for progress bar functionality.
 """
 
-import io
-import time
+import pytest
 
-from effects_logging import progressbar
-from effects_logging.core import text_writer
+import effects as fx
+from effects_logging import log_info, progressbar
+from effects_logging.core import _text_writer_set_progressbar, text_writer
+from effects_logging.types import CloseProgressBar, OpenProgressBar, ProgressBar, SetProgressBar
+from tests.io_helpers import FileOutput, TTYOutput
 
 
 class TestProgressBarBasics:
@@ -22,8 +24,7 @@ class TestProgressBarBasics:
 
     def test_progressbar_with_text_writer_yields_all_items(self):
         """Test that progressbar with text_writer yields all items."""
-        output = io.StringIO()
-        output.isatty = lambda: False  # Non-TTY for simpler testing
+        output = FileOutput()
 
         items = [1, 2, 3, 4, 5]
 
@@ -34,8 +35,7 @@ class TestProgressBarBasics:
 
     def test_progressbar_with_explicit_total(self):
         """Test progressbar with explicit total parameter."""
-        output = io.StringIO()
-        output.isatty = lambda: False
+        output = FileOutput()
 
         items = [1, 2]
 
@@ -46,8 +46,7 @@ class TestProgressBarBasics:
 
     def test_progressbar_with_desc_callback(self):
         """Test progressbar with description callback."""
-        output = io.StringIO()
-        output.isatty = lambda: False
+        output = FileOutput()
 
         items = ["file1.txt", "file2.txt"]
 
@@ -61,8 +60,7 @@ class TestProgressBarBasics:
 
     def test_progressbar_handles_exceptions_gracefully(self):
         """Test that progressbar cleans up properly when exceptions occur."""
-        output = io.StringIO()
-        output.isatty = lambda: False
+        output = FileOutput()
 
         items = [1, 2, 3, 4, 5]
         processed = []
@@ -78,182 +76,110 @@ class TestProgressBarBasics:
 
         assert processed == [1, 2, 3]
 
-
-class TestProgressBarTTYRendering:
-    """Test full TTY progress bar rendering functionality."""
-
-    def test_progressbar_tty_renders_progress_bar(self):
-        """Test that TTY progress bar actually renders visual progress bars."""
-        output = io.StringIO()
-        output.isatty = lambda: True  # TTY mode
-
-        items = [1, 2, 3, 4, 5]
+    def test_progressbar_not_rendered_to_files(self):
+        """Test that progress bars are not written to non-TTY output."""
+        output = FileOutput()
 
         with text_writer(output):
-            result = []
-            for item in progressbar(items, initial_desc="TTY Progress"):
-                result.append(item)
-                time.sleep(0.05)  # Small delay for progress bar updates
-
-        assert result == items
-        output_text = output.getvalue()
+            list(progressbar([1, 2, 3], initial_desc="Test"))
 
-        # TTY output should be much longer than file output due to rendering
-        assert len(output_text) > 100  # TTY output should be substantial
+        assert output.getvalue() == ""
 
-        # Should contain TTY-specific elements: escape sequences and progress indicators
-        has_tty_elements = any(
-            [
-                "TTY Progress" in output_text,  # Description
-                "%" in output_text,  # Percentage
-                "/" in output_text,  # Progress fraction
-                "it/s" in output_text,  # Rate
-                "█" in output_text,  # Progress bar characters
-                "-" in output_text,  # Progress bar characters
-                "|" in output_text,  # Progress bar borders
-            ]
-        )
+    def test_progressbar_coalesces_updates(self):
+        """Test that progress updates are coalesced for long iterables."""
+        updates = []
 
-        # Should have escape sequences for TTY control
-        has_escape_sequences = "\x1b" in output_text or "\r" in output_text
+        with (
+            fx.handler(lambda effect: 1, OpenProgressBar),
+            fx.handler(updates.append, SetProgressBar),
+            fx.handler(lambda effect: None, CloseProgressBar),
+        ):
+            result = list(progressbar(range(100_000)))
 
-        # At least one should be true for valid TTY progress bar output
-        assert has_tty_elements or has_escape_sequences
+        assert len(result) == 100_000
+        assert len(updates) < 2_000
+        assert updates[-1].value == 100_000
 
-    def test_progressbar_tty_with_custom_total(self):
-        """Test TTY progress bar with custom total."""
-        output = io.StringIO()
-        output.isatty = lambda: True
+    def test_set_progressbar_applies_falsy_values(self):
+        """Test that zero and empty values are applied while None leaves fields unchanged."""
+        progressbars = {1: ProgressBar(bar_id=1, value=5, total=10, description="Working")}
 
-        items = [1, 2]  # Only 2 items but total=10
+        with _text_writer_set_progressbar(progressbars):
+            fx.send(SetProgressBar(bar_id=1, value=0, description=""))
+            assert progressbars[1] == ProgressBar(bar_id=1, value=0, total=10, description="")
 
-        with text_writer(output):
-            result = []
-            for item in progressbar(items, total=10, initial_desc="Custom Total"):
-                result.append(item)
-                time.sleep(0.15)  # Longer delay to ensure progress bar renders
+            fx.send(SetProgressBar(bar_id=1))
+            assert progressbars[1] == ProgressBar(bar_id=1, value=0, total=10, description="")
 
-        assert result == items
-        output_text = output.getvalue()
 
-        # TTY output should be substantial due to progress bar rendering
-        # If output is minimal, it means progress completed too quickly
-        if len(output_text) > 50:
-            # Normal case: progress bar had time to render
-            has_progress_indicators = any(
-                [
-                    "Custom Total" in output_text,
-                    "%" in output_text,
-                    "/" in output_text,
-                    "10" in output_text,  # Total should appear
-                    "█" in output_text,  # Progress bar fill
-                    "|" in output_text,  # Progress bar structure
-                ]
-            )
-            assert has_progress_indicators
-        else:
-            # Fast completion case: should at least have TTY control sequences
-            has_tty_control = "\x1b" in output_text or "\r" in output_text
-            assert has_tty_control and len(output_text) > 0
-
-    def test_progressbar_tty_with_desc_callback(self):
-        """Test TTY progress bar with dynamic description updates."""
-        output = io.StringIO()
-        output.isatty = lambda: True
-
-        items = ["task_a", "task_b", "task_c"]
+class TestProgressBarTTYRendering:
+    """Test full TTY progress bar rendering functionality."""
 
-        def desc_callback(item):
-            return f"Processing: {item}"
+    @pytest.mark.parametrize(
+        ("items", "kwargs", "delay", "expected"),
+        [
+            pytest.param(
+                [1, 2, 3, 4, 5],
+                {"initial_desc": "TTY Progress"},
+                0.05,
+                ("TTY Progress", "100%", "5/5", "20.00it/s", "█"),
+                id="renders_progress_bar",
+            ),
+            pytest.param(
+                [1, 2],
+                {"total": 10, "initial_desc": "Custom Total"},
+                0.15,
+                ("Custom Total", "20%", "2/10"),
+                id="custom_total",
+            ),
+            pytest.param(
+                ["task_a", "task_b", "task_c"],
+                {"desc_callback": lambda item: f"Processing: {item}"},
+                0.05,
+                ("Processing: task_a", "Processing: task_c", "3/3"),
+                id="desc_callback",
+            ),
+            pytest.param(
+                [1, 2, 3],
+                {"initial_desc": "Timing Test"},
+                0.1,
+                ("Timing Test", "3/3 [ 0s< 0s", "10.00it/s"),
+                id="timing_info",
+            ),
+        ],
+    )
+    def test_progressbar_tty_rendering(self, fake_clock, items, kwargs, delay, expected):
+        """Test that TTY progress bars render the expected progress elements."""
+        output = TTYOutput()
 
         with text_writer(output):
             result = []
-            for item in progressbar(items, desc_callback=desc_callback):
+            for item in progressbar(items, **kwargs):
                 result.append(item)
-                time.sleep(0.05)
+                fake_clock.sleep(delay)
 
         assert result == items
         output_text = output.getvalue()
+        for text in expected:
+            assert text in output_text
 
-        # TTY progress bar should generate substantial output
-        assert len(output_text) > 80  # Reduced slightly as actual output is ~96 chars
-
-        # Should contain dynamic descriptions or progress elements
-        has_dynamic_content = any(
-            [
-                "task_a" in output_text,
-                "task_b" in output_text,
-                "task_c" in output_text,
-                "Processing" in output_text,
-                "/" in output_text,
-                "%" in output_text,
-                "█" in output_text,
-            ]
-        )
-
-        # Should have TTY control sequences
-        has_tty_sequences = "\x1b" in output_text or "\r" in output_text
-
-        assert has_dynamic_content or has_tty_sequences
-
-    def test_progressbar_tty_shows_timing_info(self):
-        """Test that TTY progress bar shows timing information."""
-        output = io.StringIO()
-        output.isatty = lambda: True
-
-        items = [1, 2, 3]
-
-        with text_writer(output):
-            for _ in progressbar(items, initial_desc="Timing Test"):
-                time.sleep(0.1)  # Enough delay to ensure timing updates
-
-        output_text = output.getvalue()
-
-        # TTY progress bar should generate substantial output due to timing
-        assert len(output_text) > 80
-
-        # Should contain timing-related information
-        has_timing_elements = any(
-            [
-                "s" in output_text,  # Seconds indicator
-                "it/s" in output_text,  # Rate indicator
-                "Timing Test" in output_text,  # Description
-                "[" in output_text,  # Timing brackets
-                "]" in output_text,  # Timing brackets
-                "/" in output_text,  # Progress fraction
-                "%" in output_text,  # Percentage
-            ]
-        )
-
-        # Should have TTY escape sequences
-        has_escape_sequences = "\x1b" in output_text or "\r" in output_text
-
-        assert has_timing_elements or has_escape_sequences
+    def test_progressbar_tty_rate_limits_redraws(self, fake_clock):
+        """Test that the foreground updater redraws at most once per update interval."""
+        output = TTYOutput()
 
-    def test_progressbar_tty_handles_rapid_updates(self):
-        """Test TTY progress bar with rapid updates."""
-        output = io.StringIO()
-        output.isatty = lambda: True
+        with text_writer(output, progressbar_update_interval=0.1):
+            for k in progressbar(range(1000), initial_desc="Rapid Updates"):
+                if k % 100 == 0:
+                    fake_clock.sleep(0.001)
 
-        items = list(range(20))  # Many items for rapid updates
-
-        with text_writer(output):
-            result = []
-            for item in progressbar(items, initial_desc="Rapid Updates"):
-                result.append(item)
-                if item % 5 == 0:  # Pause every 5 items to allow updates
-                    time.sleep(0.02)
-
-        assert result == items
-        assert len(result) == 20
+        # Opening frame, a single redraw within the one update interval and the closing frame
         output_text = output.getvalue()
-        # Should have some output even with rapid updates
-        assert len(output_text) > 5
+        assert output_text.count("\x1b[K") == 3
+        assert output_text.count("Rapid Updates") == 1
 
-    def test_progressbar_tty_exception_cleanup(self):
+    def test_progressbar_tty_exception_cleanup(self, fake_clock):
         """Test that TTY progress bar cleans up properly on exceptions."""
-        output = io.StringIO()
-        output.isatty = lambda: True
+        output = TTYOutput()
 
         items = [1, 2, 3, 4, 5]
         processed = []
@@ -262,7 +188,7 @@ class TestProgressBarTTYRendering:
             try:
                 for item in progressbar(items, initial_desc="Exception Test"):
                     processed.append(item)
-                    time.sleep(0.02)
+                    fake_clock.sleep(0.02)
                     if item == 3:
                         raise ValueError("Test exception")
             except ValueError:
@@ -273,48 +199,13 @@ class TestProgressBarTTYRendering:
         output_text = output.getvalue()
         assert len(output_text) > 0
 
-    def test_progressbar_tty_vs_file_output_difference(self):
-        """Test that TTY and file outputs are significantly different."""
-        items = [1, 2, 3]
-
-        # File output (isatty=False) - progress bars are not rendered to files
-        file_output = io.StringIO()
-        file_output.isatty = lambda: False
-
-        with text_writer(file_output):
-            list(progressbar(items, initial_desc="Test"))
-
-        file_text = file_output.getvalue()
-
-        # TTY output (isatty=True) - progress bars are rendered
-        tty_output = io.StringIO()
-        tty_output.isatty = lambda: True
-
-        with text_writer(tty_output):
-            for _ in progressbar(items, initial_desc="Test"):
-                time.sleep(0.05)  # Allow progress updates
-
-        tty_text = tty_output.getvalue()
-
-        # File output should be empty (progress bars don't write to files)
-        assert len(file_text) == 0
-
-        # TTY output should have content (progress bars are rendered)
-        assert len(tty_text) > 0
-
-        # TTY output should contain escape sequences
-        assert "\x1b" in tty_text or "\r" in tty_text
-
 
 class TestProgressBarWithTextWriter:
     """Test progress bar integration with text_writer."""
 
     def test_progressbar_doesnt_interfere_with_logging(self):
         """Test that progress bars don't interfere with logging."""
-        output = io.StringIO()
-        output.isatty = lambda: False
-
-        from effects_logging import log_info
+        output = FileOutput()
 
         items = [1, 2, 3]
 
@@ -328,19 +219,16 @@ class TestProgressBarWithTextWriter:
         assert "Starting" in result
         assert "Finished" in result
 
-    def test_progressbar_tty_doesnt_interfere_with_logging(self):
+    def test_progressbar_tty_doesnt_interfere_with_logging(self, fake_clock):
         """Test that TTY progress bars don't interfere with logging."""
-        output = io.StringIO()
-        output.isatty = lambda: True
-
-        from effects_logging import log_info
+        output = TTYOutput()
 
         items = [1, 2, 3]
 
         with text_writer(output):
             log_info("Starting")
             for _ in progressbar(items, initial_desc="Working"):
-                time.sleep(0.02)
+                fake_clock.sleep(0.02)
             log_info("Finished")
 
         result = output.getvalue()
@@ -2,8 +2,6 @@
 Tests for package types and data structures.
 """
 
-import uuid
-
 from effects_logging.types import (
     CloseProgressBar,
     LogLevel,
@@ -56,7 +54,7 @@ class TestProgressBar:
 
     def test_progress_bar_creation(self):
         """Test creating ProgressBar instances."""
-        bar_id = uuid.uuid4()
+        bar_id = 1
         bar = ProgressBar(bar_id=bar_id)
 
         assert bar.bar_id == bar_id
@@ -67,7 +65,7 @@ class TestProgressBar:
 
     def test_progress_bar_with_values(self):
         """Test ProgressBar with custom values."""
-        bar_id = uuid.uuid4()
+        bar_id = 1
         bar = ProgressBar(
             bar_id=bar_id, value=50, total=100, description="Processing", start_time=123.45
         )
@@ -85,7 +83,7 @@ class TestProgressBarEffects:
     def test_open_progress_bar_effect(self):
         """Test OpenProgressBar effect."""
         # With explicit bar_id
-        bar_id = uuid.uuid4()
+        bar_id = 1
         effect = OpenProgressBar(bar_id=bar_id)
         assert effect.bar_id == bar_id
 
@@ -95,7 +93,7 @@ class TestProgressBarEffects:
 
     def test_set_progress_bar_effect(self):
         """Test SetProgressBar effect."""
-        bar_id = uuid.uuid4()
+        bar_id = 1
         effect = SetProgressBar(
             bar_id=bar_id, value=25, total=100, description="Working", start_time=1.0
         )
@@ -108,7 +106,7 @@ class TestProgressBarEffects:
 
     def test_set_progress_bar_effect_partial(self):
         """Test SetProgressBar with partial updates."""
-        bar_id = uuid.uuid4()
+        bar_id = 1
         effect = SetProgressBar(bar_id=bar_id, value=10)
 
         assert effect.bar_id == bar_id
@@ -119,6 +117,6 @@ class TestProgressBarEffects:
 
     def test_close_progress_bar_effect(self):
         """Test CloseProgressBar effect."""
-        bar_id = uuid.uuid4()
+        bar_id = 1
         effect = CloseProgressBar(bar_id=bar_id)
         assert effect.bar_id == bar_id